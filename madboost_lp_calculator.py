@@ -1,102 +1,64 @@
 # Run with: streamlit run madboost_lp_calculator.py
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+
+from pricing_core import (
+    DIVISIONS,
+    GAIN_IDX,
+    RANKS,
+    calculate_lp_between_ranks,
+    calculate_price_progression as _calculate_price_progression,
+)
 
 # -----------------------------------------------------------
 # RANK & LP SYSTEM
 # -----------------------------------------------------------
 
-RANKS = ["Iron", "Bronze", "Silver", "Gold", "Platinum", "Emerald", "Diamond"]
-DIVISIONS = ["IV", "III", "II", "I"]
-LP_PER_DIVISION = 100
-
-
-def rank_index(rank, div):
-    return RANKS.index(rank) * len(DIVISIONS) + DIVISIONS.index(div)
+TARGET_LP_OPTIONS = (10, 30, 50, 70, 90)
+GAIN_LEVELS = ("low", "mid", "high")
 
-
-def calculate_lp_between_ranks(current_rank, current_div, current_lp,
-                               target_rank, target_div, target_lp):
-    """Compute total LP distance between current and target ranks."""
-    curr_idx = rank_index(current_rank, current_div)
-    target_idx = rank_index(target_rank, target_div)
-
-    if target_idx < curr_idx or (target_idx == curr_idx and target_lp <= current_lp):
-        return 0, 0, 0
-
-    total_lp = 0
-    if curr_idx == target_idx:
-        total_lp = target_lp - current_lp
-    else:
-        # LP remaining in current division
-        total_lp += (LP_PER_DIVISION - current_lp)
-        # LP in intermediate divisions
-        for i in range(curr_idx + 1, target_idx):
-            total_lp += LP_PER_DIVISION
-        # LP in target division
-        total_lp += target_lp
-
-    divs = abs(target_idx - curr_idx)
-    ranks = abs(RANKS.index(target_rank) - RANKS.index(current_rank))
-    # Returns an integer LP value
-    return int(total_lp), divs, ranks
-
-
-# -----------------------------------------------------------
-# PRICE PROGRESSION LOGIC
-# -----------------------------------------------------------
-
-def calculate_price_progression(base_price, total_lp, lp_key, multipliers):
-    """
-    Progressive LP pricing based on a specific multiplier key from the multipliers dictionary.
-    lp_key will be 'fixed' for the ref path, and 'low/mid/high' for the client path.
-    """
-    growth = multipliers[lp_key] / 100.0
-    step_price = base_price
-    total_price = 0.0
-    progression = []
-
-    for step in range(1, int(total_lp) + 1):
-        # Applies the price growth
-        step_price *= (1 + growth)
-        total_price += step_price
-        
-        # Records progression every 10 steps or at the final step
-        if step % 10 == 0 or step == int(total_lp):
-            progression.append({
-                "LP Step": step,
-                "Step Price ($)": round(step_price, 4), # Keeping 4 decimal places for internal precision
-                "Cumulative ($)": round(total_price, 2)
-            })
-
-    # Total price is rounded to 2 decimal places for currency display
-    return round(total_price, 2), progression, step_price
+# Pure logic lives in pricing_core; only the Streamlit cache is layered on here
+calculate_price_progression = st.cache_data(show_spinner=False)(_calculate_price_progression)
 
 
 # -----------------------------------------------------------
 # STREAMLIT UI
 # -----------------------------------------------------------
 
-st.set_page_config(page_title="MadBoost Rank Boost Calculator", layout="wide")
+# Page config persists in the browser session, so it only needs sending once
+if "_configured" not in st.session_state:
+    st.set_page_config(page_title="MadBoost Rank Boost Calculator", layout="wide")
+    st.session_state["_configured"] = True
 
 # --- Styling ---
-st.markdown("""
+_CSS = """
 <style>
 body {background-color: #0e0e0e; color: #fff;}
 .stApp {background-color: #0e0e0e;}
 h1, h2, h3, h4, h5, h6, label, p {color: white !important;}
-.stButton button {background-color: #ff5a00; color: white; border-radius: 10px; font-weight: bold;}
-.stButton button:hover {background-color: #ff7b33; color: black;}
+.stButton button, .stFormSubmitButton button {background-color: #ff5a00; color: white; border-radius: 10px; font-weight: bold;}
+.stButton button:hover, .stFormSubmitButton button:hover {background-color: #ff7b33; color: black;}
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # --- Header ---
+LOGO_PATH = Path(__file__).with_name("madboost_logo.jpg")
+
+
+@st.cache_data(show_spinner=False)
+def _load_logo():
+    # Read once per process; None falls back to the text logo
+    return LOGO_PATH.read_bytes() if LOGO_PATH.exists() else None
+
+
 col1, col2 = st.columns([1, 3])
 with col1:
-    try:
-        st.image("madboost_logo.jpg", width=180) 
-    except:
+    logo = _load_logo()
+    if logo:
+        st.image(logo, width=180)
+    else:
         st.write("🔥 **MadBoost**")
 with col2:
     st.title("MadBoost Rank Boost Calculator")
@@ -107,7 +69,8 @@ st.markdown("---")
 # --- Inputs ---
 col_left, col_right = st.columns([1, 2])
 
-with col_left:
+# Inside a form, widget edits are batched and the script only reruns on submit
+with col_left, st.form("calc_form"):
     st.subheader("🎯 Current Rank")
     current_rank = st.selectbox("Current Rank", RANKS, index=0)
     current_div = st.selectbox("Current Division", DIVISIONS, index=0)
@@ -123,7 +86,7 @@ with col_left:
     st.subheader("🚀 Target Rank")
     target_rank = st.selectbox("Target Rank", RANKS, index=2)
     target_div = st.selectbox("Target Division", DIVISIONS, index=0)
-    target_lp = st.selectbox("Target LP", [10, 30, 50, 70, 90], index=2)
+    target_lp = st.selectbox("Target LP", TARGET_LP_OPTIONS, index=2)
 
     st.markdown("### 💵 Pricing Settings")
     # Base LP price accepts three decimal places
@@ -141,7 +104,7 @@ with col_left:
                               format="%.3f")
 
     # User selects gain level for the CLIENT PATH
-    lp_gain = st.selectbox("Gain Level (Client Path Only)", ["low", "mid", "high"])
+    lp_gain = st.selectbox("Gain Level (Client Path Only)", GAIN_LEVELS)
 
     st.markdown("### Tier Multipliers (%) (Client Path Only)")
     # Multipliers for Low/Mid/High (used by Client Path only)
@@ -149,14 +112,20 @@ with col_left:
     m_mid = st.number_input("Mid (%)", min_value=0.000, value=10.000, step=0.001, format="%.3f")
     m_high = st.number_input("High (%)", min_value=0.000, value=20.000, step=0.001, format="%.3f")
     
-    # Separate multipliers for the two paths
-    ref_multipliers = {"fixed": m_fixed} # Used for Iron IV -> Current
-    client_multipliers = {"low": m_low, "mid": m_mid, "high": m_high} # Used for Current -> Target
+    # Separate multipliers for the two paths, as tuples so cache keys hash cheaply
+    ref_multipliers = (m_fixed,) # Used for Iron IV -> Current
+    client_multipliers = (m_low, m_mid, m_high) # Used for Current -> Target
 
     st.markdown(" ")
-    calc_button = st.button("💰 **Calculate Boost Price**")
+    calc_button = st.form_submit_button("💰 **Calculate Boost Price**")
 
 # --- Results ---
+# Display formatting for the progression tables, so the data itself is never rounded
+PROGRESSION_COLUMN_CONFIG = {
+    "Step Price ($)": st.column_config.NumberColumn(format="%.4f"), # 4 decimal places for internal precision
+    "Cumulative ($)": st.column_config.NumberColumn(format="%.2f"),
+}
+
 with col_right:
     if calc_button:
         total_lp, divs, ranks = calculate_lp_between_ranks(
@@ -167,12 +136,19 @@ with col_right:
             st.warning("⚠️ Invalid input — target rank must be higher or LP greater.")
         else:
             # ---------- REFERENCE PATH: Iron IV → Current ----------
-            ref_lp, _, _ = calculate_lp_between_ranks("Iron", "IV", 0, current_rank, current_div, current_lp)
-            
-            # 🔑 Use 'fixed' key and ref_multipliers for the Reference Path
-            ref_total_price, ref_progression, ref_final_step = calculate_price_progression(
-                base_price, ref_lp, "fixed", ref_multipliers
-            )
+            # Kept in session_state so iterating on the target reuses it without re-hashing
+            ref_key = (current_rank, current_div, current_lp, base_price, m_fixed)
+            if st.session_state.get("ref_key") == ref_key:
+                ref_lp, ref_total_price, ref_progression, ref_final_step = st.session_state["ref_cache"]
+            else:
+                ref_lp, _, _ = calculate_lp_between_ranks("Iron", "IV", 0, current_rank, current_div, current_lp)
+
+                # 🔑 Use 'fixed' key and ref_multipliers for the Reference Path
+                ref_total_price, ref_progression, ref_final_step = calculate_price_progression(
+                    base_price, ref_lp, "fixed", ref_multipliers
+                )
+                st.session_state["ref_key"] = ref_key
+                st.session_state["ref_cache"] = (ref_lp, ref_total_price, ref_progression, ref_final_step)
 
             # ---------- CLIENT PATH: Current → Target ----------
             # Use user-selected lp_gain and client_multipliers for the Client Path
@@ -180,18 +156,18 @@ with col_right:
                 ref_final_step, total_lp, lp_gain.lower(), client_multipliers
             )
 
-            # ---------- DataFrames ----------
-            df_ref = pd.DataFrame(ref_progression)
-            df_client = pd.DataFrame(client_progression)
-            
-            # FIX FOR KEY ERROR: Only proceed if the DataFrames have content
-            if not df_ref.empty and not df_client.empty:
+            # FIX FOR KEY ERROR: Only proceed if both progressions have content
+            if ref_progression["LP Step"].size and client_progression["LP Step"].size:
                 
                 # --- Summary ---
                 st.subheader(f"Results — {current_rank} {current_div} → {target_rank} {target_div} ({target_lp} LP)")
                 st.info(f"🧮 Total LP Required: **{total_lp} LP**")
                 st.success(f"🎯 Divisions: {divs} | Ranks: {ranks}")
 
+                # Under 10 LP the client path has a single sampled row, so the
+                # tables and chart add nothing over the metrics
+                show_progression = total_lp >= 10
+
                 colA, colB = st.columns(2)
                 with colA:
                     st.markdown("### 🧱 Reference Path (Iron IV → Current)")
@@ -199,32 +175,40 @@ with col_right:
                     st.metric("Total LP", f"{ref_lp}")
                     st.metric("Total Price", f"${ref_total_price:,.2f}")
                     st.metric("Final Step Price", f"${ref_final_step:.4f}")
-                    st.dataframe(df_ref, use_container_width=True)
 
                 with colB:
                     st.markdown("### 🚀 Client Path (Current → Target)")
-                    st.metric("Multiplier Used", f"{client_multipliers[lp_gain.lower()]:.3f}% ({lp_gain.capitalize()})")
+                    st.metric("Multiplier Used", f"{client_multipliers[GAIN_IDX[lp_gain.lower()]]:.3f}% ({lp_gain.capitalize()})")
                     st.metric("Total LP", f"{total_lp}")
                     st.metric("Total Price", f"${client_total_price:,.2f}")
                     st.metric("Starting LP Price", f"${ref_final_step:.4f}")
-                    st.dataframe(df_client, use_container_width=True)
+
+                # Tables go out after both columns' metrics, so the scalar results paint
+                # first; re-entering a column appends below its metrics, so layout is unchanged.
+                # Collapsed expanders keep the browser from laying out the grids until opened
+                if show_progression:
+                    with colA, st.expander("Show progression table"):
+                        st.dataframe(ref_progression, hide_index=True, use_container_width=True,
+                                     column_config=PROGRESSION_COLUMN_CONFIG)
+                    with colB, st.expander("Show progression table"):
+                        st.dataframe(client_progression, hide_index=True, use_container_width=True,
+                                     column_config=PROGRESSION_COLUMN_CONFIG)
 
                 # --- Charts ---
-                st.markdown("### 📈 LP Price Progression Comparison")
-                fig, ax = plt.subplots()
-                # The plotting is now safe from KeyErrors because we checked if the DFs are empty
-                ax.plot(df_ref["LP Step"], df_ref["Step Price ($)"], label="Reference Path (Fixed Rate)")
-                ax.plot(df_client["LP Step"], df_client["Step Price ($)"], label=f"Client Path ({lp_gain.capitalize()} Rate)")
-                ax.set_xlabel("LP Step")
-                ax.set_ylabel("Price ($)")
-                ax.legend() 
-                ax.set_facecolor("#1e1e1e")
-                ax.tick_params(colors='white', which='both')
-                ax.spines['left'].set_color('white')
-                ax.spines['bottom'].set_color('white')
-                fig.patch.set_facecolor('#0e0e0e')
-                ax.title.set_color('white')
-                st.pyplot(fig)
+                if show_progression:
+                    # Deferred so a cold start only pays for streamlit; later runs reuse the loaded module
+                    import pandas as pd
+
+                    # The plotting is now safe from KeyErrors because we checked if the progressions are empty
+                    # Rendered client-side by Vega-Lite, so no server-side rasterization per rerun
+                    chart_df = pd.concat([
+                        pd.Series(ref_progression["Step Price ($)"], index=ref_progression["LP Step"],
+                                  name="Reference Path (Fixed Rate)"),
+                        pd.Series(client_progression["Step Price ($)"], index=client_progression["LP Step"],
+                                  name=f"Client Path ({lp_gain.capitalize()} Rate)"),
+                    ], axis=1)
+                    with st.expander("📈 LP Price Progression Comparison"):
+                        st.line_chart(chart_df, x_label="LP Step", y_label="Price ($)")
 
                 st.success("✅ Calculation complete!")
 
@@ -0,0 +1,116 @@
+# Rank/LP and pricing logic for the MadBoost calculator, kept free of Streamlit.
+# Imported modules survive Streamlit reruns, so the lru_caches below persist
+# across reruns instead of being rebuilt with the script each time.
+from functools import lru_cache
+
+import numpy as np
+
+# -----------------------------------------------------------
+# RANK & LP SYSTEM
+# -----------------------------------------------------------
+
+# Tuples: immutable and hashable, so they are safe to share with cached helpers
+RANKS = ("Iron", "Bronze", "Silver", "Gold", "Platinum", "Emerald", "Diamond")
+DIVISIONS = ("IV", "III", "II", "I")
+LP_PER_DIVISION = 100
+
+# Precomputed lookups so rank/division positions are O(1) instead of list scans
+_RANK_IDX = {rank: i for i, rank in enumerate(RANKS)}
+_RANK_DIV_IDX = {(rank, div): i * len(DIVISIONS) + j
+                 for i, rank in enumerate(RANKS)
+                 for j, div in enumerate(DIVISIONS)}
+
+
+def rank_index(rank, div):
+    return _RANK_DIV_IDX[(rank, div)]
+
+
+@lru_cache(maxsize=4096)
+def calculate_lp_between_ranks(current_rank, current_div, current_lp,
+                               target_rank, target_div, target_lp):
+    """Compute total LP distance between current and target ranks."""
+    curr_idx = rank_index(current_rank, current_div)
+    target_idx = rank_index(target_rank, target_div)
+
+    if target_idx < curr_idx or (target_idx == curr_idx and target_lp <= current_lp):
+        return 0, 0, 0
+
+    # LP left in the current division, full intermediate divisions, and LP into the
+    # target division; reduces to target_lp - current_lp within the same division
+    total_lp = (target_idx - curr_idx) * LP_PER_DIVISION - current_lp + target_lp
+
+    # target_idx >= curr_idx past the guard above, so no abs() is needed
+    divs = target_idx - curr_idx
+    ranks = _RANK_IDX[target_rank] - _RANK_IDX[current_rank]
+    # Returns an integer LP value
+    return int(total_lp), divs, ranks
+
+
+# -----------------------------------------------------------
+# PRICE PROGRESSION LOGIC
+# -----------------------------------------------------------
+
+# Position of each gain key in its multipliers tuple: the ref path passes the
+# single-rate (m_fixed,) tuple, the client path passes (m_low, m_mid, m_high)
+GAIN_IDX = {"fixed": 0, "low": 0, "mid": 1, "high": 2}
+
+
+@lru_cache(maxsize=128)
+def _progression_core(total_lp, growth):
+    """
+    Numeric core of the price progression for a base price of 1: sampled LP steps
+    (every 10 steps and the final step) with their unit step prices and unit
+    cumulative totals. Every path shares this shape, so callers just scale it by
+    their own base price. Arrays are read-only since they are shared via the cache.
+    """
+    r = np.float64(1 + growth)
+
+    # Records progression every 10 steps or at the final step. Paths top out
+    # below 3000 LP, so int32 halves the column's Arrow payload versus int64
+    steps = np.arange(10, total_lp + 1, 10, dtype=np.int32)
+    if total_lp > 0 and total_lp % 10:
+        steps = np.append(steps, np.int32(total_lp))
+
+    # Very long paths at high rates overflow to inf, same as the old running product
+    with np.errstate(over="ignore"):
+        # Growth factor at each sampled step, i.e. the unit step price
+        unit_step = np.power(r, steps)
+        # Geometric series sum of the first `step` unit step prices
+        if growth == 0:
+            unit_cumulative = steps.astype(np.float64)
+        else:
+            # r / growth is invariant across steps: one scalar, one array multiply
+            unit_cumulative = (unit_step - 1) * (r / growth)
+
+    for arr in (steps, unit_step, unit_cumulative):
+        arr.flags.writeable = False
+    return steps, unit_step, unit_cumulative
+
+
+def calculate_price_progression(base_price, total_lp, lp_key, multipliers):
+    """
+    Progressive LP pricing based on a specific multiplier key from the multipliers tuple.
+    lp_key will be 'fixed' for the ref path, and 'low/mid/high' for the client path.
+    """
+    growth = multipliers[GAIN_IDX[lp_key]] / 100.0
+    steps, unit_step, unit_cumulative = _progression_core(int(total_lp), growth)
+    with np.errstate(over="ignore"):
+        step_prices = base_price * unit_step
+        cumulative = base_price * unit_cumulative
+
+    # Columns stay NumPy arrays; st.dataframe takes them without a pandas round-trip.
+    # Values keep full precision, display rounding is left to the caller
+    progression = {
+        "LP Step": steps,
+        "Step Price ($)": step_prices,
+        "Cumulative ($)": cumulative
+    }
+
+    # The final step is always sampled, so its values are the path totals
+    if steps.size:
+        total_price, final_step_price = float(cumulative[-1]), float(step_prices[-1])
+    else:
+        total_price, final_step_price = 0.0, base_price
+
+    # Total price is rounded to 2 decimal places for currency display
+    return round(total_price, 2), progression, final_step_price